@@ -1,16 +1,57 @@
-"""Initialises the global instance & console and setups logging."""
+"""
+Lazily creates the global instance & console.
 
-import dotenv
-from rich.console import Console
+The instance and console are only created when they're first accessed,
+so commands which don't talk to Spotify skip importing spotipy & rich.
+"""
+import threading
+import typing as t
 
-from spotils.client import generate_global_instance
-from spotils.config import load_config_data
-from spotils.helpers.logging import setup_logging
-from spotils.meta import __app_name__, __version__
+from spotils.meta import __app_name__
 
-load_config_data()
-setup_logging()
+if t.TYPE_CHECKING:
+    from rich.console import Console
 
-dotenv.load_dotenv()
-console = Console()
-instance = generate_global_instance()
+    from spotils.client import ModeledSpotify
+
+__all__ = ["console", "instance", "__version__", "__app_name__"]
+
+# These are resolved by __getattr__ on first access.
+__version__: str
+console: "Console"
+instance: "ModeledSpotify"
+
+_creation_lock = threading.RLock()
+
+
+def __getattr__(name: str) -> t.Any:
+    """
+    Resolve the version, global console and instance on first access.
+
+    The created objects are cached in the module's globals, so they're
+    only created once, even when multiple threads access them at once.
+    """
+    if name not in ("__version__", "console", "instance"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _creation_lock:
+        # Another thread may have created it while this one was waiting.
+        if name in globals():
+            return globals()[name]
+
+        if name == "__version__":
+            from spotils import meta
+
+            value = meta.__version__
+        elif name == "console":
+            from rich.console import Console
+
+            value = Console()
+        else:
+            from spotils.client import generate_global_instance
+
+            value = generate_global_instance()
+
+        globals()[name] = value
+
+    return value
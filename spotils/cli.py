@@ -1,22 +1,24 @@
-"""Defines the CLI interface."""
+"""
+Defines the CLI interface.
+
+The command bodies live in spotils.cli_impl, which is only imported
+when a command runs, so showing the help stays cheap.
+"""
+import functools
 import typing as t
 
 import click
 from click.shell_completion import CompletionItem
-from rich.pretty import Pretty
 
-from spotils import console
 from spotils.config import (
-    config_data,
     default_config_data,
+    ensure_config_loaded,
     local_config_data,
     set_config_value,
     unset_config_key,
 )
 from spotils.helpers.nested_key_mapping import ConfigMapping
-from spotils.helpers.scheduler import run_tasks
 from spotils.type_aliases import JSONVals
-from spotils.utils.recently_played import print_recently_played_tracks
 
 
 @click.group(
@@ -38,7 +40,7 @@ def validate_config_key(
     key: str,
 ) -> str:
     """Validate that the given key exists in the default config."""
-    if key not in default_config_data:
+    if key not in default_config_data.flat_keyset:
         raise click.BadParameter(f"'{key}' is not a valid config key.")
 
     return key
@@ -61,12 +63,26 @@ def validate_local_config_atomic_key(
     """Validate that the given key exists in the local config."""
     # We need to ensure it's a valid key first.
     validate_config_atomic_key(ctx, param, key)
-    if key in local_config_data:
+    if key in local_config_data.flat_keyset:
         return key
 
     raise click.BadParameter(f"'{key}' has not been set yet.")
 
 
+@functools.cache
+def get_config_converters() -> dict[str, click.ParamType]:
+    """
+    Map each atomic config key to a converter for its values.
+
+    The converter is chosen by the type of the key's default value.
+    The mapping is only built once.
+    """
+    return {
+        key: click.types.convert_type(type(default_config_data[key]))
+        for key in default_config_data.flat_keys
+    }
+
+
 def parse_config_value(
     ctx: click.Context, param: click.Parameter, value: str
 ) -> JSONVals:
@@ -77,9 +93,7 @@ def parse_config_value(
     acceptable, according to Click's converting scheme.
     Returns the converted value.
     """
-    key = ctx.params["key"]
-    target_type = type(default_config_data[key])
-    converter = click.types.convert_type(target_type)
+    converter = get_config_converters()[ctx.params["key"]]
     value = converter.convert(value, param, ctx)
     return value
 
@@ -96,28 +110,11 @@ def complete_keys(
     The keys are pulled from the config argument.
     By default, config points to the default config.
     """
-    to_parse: list[tuple[str, t.Mapping]] = [("", config)]
-    available_keys: list[str] = []
-
-    while to_parse:
-        current = to_parse.pop()
-        parent_key, value = current
-
-        if not isinstance(value, t.Mapping):
-            available_keys.append(parent_key)
-            continue
-
-        for subkey, subvalue in value.items():
-            new_key = f"{parent_key}.{subkey}" if parent_key else subkey
-
-            if isinstance(subvalue, t.Mapping):
-                to_parse.append((new_key, subvalue))
-            else:
-                available_keys.append(new_key)
-
+    # Completion doesn't invoke the config group's callback.
+    ensure_config_loaded()
     return [
         CompletionItem(key)
-        for key in available_keys
+        for key in config.flat_keys
         if key.startswith(incomplete)
     ]
 
@@ -134,12 +131,8 @@ def complete_local_keys(
 @app.group()
 def config() -> None:
     """Change/Read the application's config."""
-
-
-def pretty_print(mapping: ConfigMapping) -> None:
-    """Pretty print a config mapping with rich."""
-    # We need to pass the internal dict to get the desired output.
-    console.print(Pretty(mapping.data, expand_all=True))
+    # This runs before the subcommand's parameters are processed.
+    ensure_config_loaded()
 
 
 def print_config(
@@ -148,6 +141,9 @@ def print_config(
     """Print the current config."""
     if not value or ctx.resilient_parsing:
         return
+
+    from spotils.cli_impl import pretty_print
+
     pretty_print(default_config_data)
     ctx.exit()
 
@@ -158,6 +154,9 @@ def print_overriden_config(
     """Print the default config."""
     if not value or ctx.resilient_parsing:
         return
+
+    from spotils.cli_impl import pretty_print
+
     pretty_print(local_config_data)
     ctx.exit()
 
@@ -189,7 +188,9 @@ def get(key: str) -> None:
 
     Example: spotils config get spotify.liked_songs_playlist_id
     """
-    console.print(config_data[key])
+    from spotils.cli_impl import print_config_value
+
+    print_config_value(key)
 
 
 @config.command()
@@ -238,10 +239,14 @@ def unset(key: str) -> None:
 )
 def recent(limit: int) -> None:
     """Display recently streamed tracks."""
-    print_recently_played_tracks(limit)
+    from spotils import cli_impl
+
+    cli_impl.recent(limit)
 
 
 @app.command()
 def run() -> None:
     """Run all the enabled tasks."""
-    run_tasks()
+    from spotils import cli_impl
+
+    cli_impl.run()
@@ -0,0 +1,40 @@
+"""
+Implements the bodies of the CLI commands.
+
+The CLI only imports this module once a command is invoked, and each
+function imports its own dependencies, so a command only pays for what
+it uses.
+"""
+from spotils.config import config_data
+from spotils.helpers.nested_key_mapping import ConfigMapping
+
+
+def pretty_print(mapping: ConfigMapping) -> None:
+    """Pretty print a config mapping with rich."""
+    from rich.pretty import Pretty
+
+    from spotils import console
+
+    # We need to pass the internal dict to get the desired output.
+    console.print(Pretty(dict(mapping), expand_all=True))
+
+
+def print_config_value(key: str) -> None:
+    """Print the value of a config key."""
+    from spotils import console
+
+    console.print(config_data[key])
+
+
+def recent(limit: int) -> None:
+    """Display recently streamed tracks."""
+    from spotils.utils.recently_played import print_recently_played_tracks
+
+    print_recently_played_tracks(limit)
+
+
+def run() -> None:
+    """Run all the enabled tasks."""
+    from spotils.helpers.scheduler import run_tasks
+
+    run_tasks()
@@ -3,15 +3,20 @@ A spotify client implementation which returns models upon API requests.
 
 Subclasses spotipy.Spotify.
 """
+import hashlib
+import json
+import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-import cachecontrol
-import requests
-import requests.adapters
+import dotenv
 import spotipy
-import urllib3
 from spotipy import Spotify
 
+from spotils.helpers.files import atomic_write_bytes, read_json_if_fresh
+from spotils.helpers.logging import setup_logging
+from spotils.meta import APPLICATION_PATHS
 from spotils.models import (
     CurrentUser,
     Model,
@@ -29,7 +34,7 @@ MT = t.TypeVar("MT", bound=Model)
 PMT = t.TypeVar("PMT", bound=PagedModel)
 
 
-SCOPES = [
+SCOPES: tuple[str, ...] = (
     "playlist-read-private",
     "playlist-read-collaborative",
     "playlist-modify-private",
@@ -38,21 +43,89 @@ SCOPES = [
     "user-modify-playback-state",
     "user-read-playback-state",
     "user-read-recently-played",
-]
+)
+# The comma separated form of SCOPES, as expected by SpotifyOAuth.
+SCOPE_STRING = (
+    "playlist-read-private,playlist-read-collaborative,"
+    "playlist-modify-private,playlist-modify-public,"
+    "user-library-read,user-modify-playback-state,"
+    "user-read-playback-state,user-read-recently-played"
+)
+
+CURRENT_USER_CACHE_DIR = APPLICATION_PATHS.user_cache_path / "current_user"
+CURRENT_USER_CACHE_TTL = 24 * 60 * 60
+
+
+def clear_current_user_cache() -> None:
+    """Remove the cached current user details of every account."""
+    for path in CURRENT_USER_CACHE_DIR.glob("*.json"):
+        path.unlink(missing_ok=True)
+
+
+class MemoizedSpotifyOAuth(spotipy.SpotifyOAuth):
+    """
+    A SpotifyOAuth which keeps the access token in memory.
+
+    SpotifyOAuth reads the token cache on every request, so the token
+    info is instead reused until it's about to expire, or until it's
+    invalidated through clear_memoized_token.
+    """
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Initialise the auth manager without a memoized token."""
+        super().__init__(*args, **kwargs)
+        self.memoized_token_info: t.Optional[dict[str, t.Any]] = None
+
+    def get_access_token(
+        self,
+        code: t.Optional[str] = None,
+        as_dict: bool = True,
+        check_cache: bool = True,
+    ) -> t.Any:
+        """
+        Get the access token, preferring the memoized token info.
+
+        The token cache is only read when there's no usable memoized
+        token, and the token info it holds is memoized afterwards.
+        """
+        token_info = self.memoized_token_info
+        if (
+            code is None
+            and check_cache
+            and token_info is not None
+            and not self.is_token_expired(token_info)
+        ):
+            return token_info if as_dict else token_info["access_token"]
+
+        token = super().get_access_token(code, as_dict, check_cache)
+        self.memoized_token_info = self.cache_handler.get_cached_token()
+        return token
+
+    def clear_memoized_token(self) -> None:
+        """Make the next request read the token from the cache again."""
+        self.memoized_token_info = None
 
 
 class ModeledSpotify(Spotify):
     """A wrapper to spotipy.Spotify which returns data as Models."""
 
+    # The API accepts upto 50 ids when checking saved tracks.
+    SAVED_TRACKS_BATCH_SIZE = 50
+    SAVED_TRACKS_MAX_WORKERS = 4
+    SAVED_TRACKS_CACHE_TTL = 30
+    SAVED_TRACKS_CACHE_MAX_SIZE = 1000
+
     def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
         """
         Initialize the client.
 
         Forwards args and kwargs to the super class, and initializes
-        an attribute for storing cached user details.
+        attributes for storing cached user details and the cached
+        saved statuses of tracks, along the time they were fetched at.
         """
         super().__init__(*args, **kwargs)
         self.current_user_details: t.Optional[CurrentUser] = None
+        self.saved_tracks_cache: dict[str, tuple[bool, float]] = {}
 
     # TODO: Override other methods for type-hinting arguments.
     @staticmethod
@@ -67,28 +140,21 @@ class ModeledSpotify(Spotify):
         if data is not None:
             return model(data)
 
-    @staticmethod
-    def _casted_response(data: t.Any) -> ModelableJSON:
-        """Cast the data to the ModelableJSON type."""
-        return t.cast(ModelableJSON, data)
-
     def current_playback(self) -> t.Optional[PlaybackState]:
         """Get information about user's current playback."""
-        response_data = self._casted_response(super().current_playback())
+        response_data: ModelableJSON = super().current_playback()
         return self._optional_model(PlaybackState, response_data)
 
     def current_user_recently_played(self, limit: int = 50) -> RecentlyPlayed:
         """Get the current user's recently played tracks."""
-        response_data = self._casted_response(
-            super().current_user_recently_played(limit)
+        response_data: ModelableJSON = super().current_user_recently_played(
+            limit
         )
         return RecentlyPlayed(response_data)
 
     def current_user_saved_tracks(self) -> SavedTracks:
         """Get a list of the saved tracks of the current user."""
-        response_data = self._casted_response(
-            super().current_user_saved_tracks(50)
-        )
+        response_data: ModelableJSON = super().current_user_saved_tracks(50)
         return SavedTracks(response_data)
 
     def next(self, model: PMT) -> t.Optional[PMT]:
@@ -97,10 +163,29 @@ class ModeledSpotify(Spotify):
             return None
         return self._optional_model(type(model), self._get(model.next))
 
+    def iter_pages(self, first: PMT) -> t.Iterator[PMT]:
+        """
+        Iterate over the pages of a paged result, starting from first.
+
+        The next page is fetched in a background thread while the
+        current page is being consumed.
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        page: t.Optional[PMT] = first
+        try:
+            while page is not None:
+                future = (
+                    executor.submit(self.next, page) if page.next else None
+                )
+                yield page
+                page = future.result() if future else None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def playlist_tracks(self, playlist_id: str) -> PlaylistTracks:
         """Get full details of the tracks of a playlist."""
-        response_data = self._casted_response(
-            self.playlist_items(playlist_id, additional_types=("track",))
+        response_data: ModelableJSON = self.playlist_items(
+            playlist_id, additional_types=("track",)
         )
         return PlaylistTracks(response_data)
 
@@ -110,8 +195,8 @@ class ModeledSpotify(Spotify):
 
         Only track items are fetched.
         """
-        response_data = self._casted_response(
-            super().playlist(playlist_id, additional_types=("track",))
+        response_data: ModelableJSON = super().playlist(
+            playlist_id, additional_types=("track",)
         )
         return PlaylistDetails(response_data)
 
@@ -126,84 +211,170 @@ class ModeledSpotify(Spotify):
 
         The playlist's new snapshot id is returned.
         """
-        response_data = self._casted_response(
-            super().playlist_add_items(playlist_id, tracks, position)
+        response_data: ModelableJSON = super().playlist_add_items(
+            playlist_id, tracks, position
         )
         return t.cast(str, response_data["snapshot_id"])
 
-    def current_user_saved_tracks_contains(
-        self, tracks: list[str]
-    ) -> list[bool]:
-        """Check if tracks are liked by the current user."""
-        response_data = self._casted_response(
-            super().current_user_saved_tracks_contains(tracks)
-        )
-        return t.cast(list[bool], response_data)
+    def playlist_remove_specific_occurrences_of_items(
+        self,
+        playlist_id: str,
+        items: list[dict[str, t.Any]],
+        snapshot_id: t.Optional[str] = None,
+    ) -> str:
+        """
+        Remove tracks/episodes at specific positions from a playlist.
 
-    def current_user_playlists(self) -> Playlists:
-        """Get a list of the playlists of the current user."""
-        response_data = self._casted_response(super().current_user_playlists())
-        return Playlists(response_data)
+        The playlist's new snapshot id is returned.
+        """
+        response_data: ModelableJSON = (
+            super().playlist_remove_specific_occurrences_of_items(
+                playlist_id, items, snapshot_id
+            )
+        )
+        return t.cast(str, response_data["snapshot_id"])
 
-    def current_user(self) -> CurrentUser:
+    def playlist_reorder_items(
+        self,
+        playlist_id: str,
+        range_start: int,
+        insert_before: int,
+        range_length: int = 1,
+        snapshot_id: t.Optional[str] = None,
+    ) -> str:
         """
-        Get detailed profile information about the current user.
+        Move a range of tracks/episodes to a different position.
 
-        The information is cached.
+        The playlist's new snapshot id is returned.
         """
-        if self.current_user_details is None:
-            response_data = self._casted_response(super().current_user())
-            self.current_user_details = CurrentUser(response_data)
+        response_data: ModelableJSON = super().playlist_reorder_items(
+            playlist_id, range_start, insert_before, range_length, snapshot_id
+        )
+        return t.cast(str, response_data["snapshot_id"])
 
-        return self.current_user_details
+    def playlist_replace_items(
+        self, playlist_id: str, items: list[str]
+    ) -> str:
+        """
+        Replace all the tracks/episodes of a playlist.
 
+        The playlist's new snapshot id is returned.
+        """
+        response_data: ModelableJSON = super().playlist_replace_items(
+            playlist_id, items
+        )
+        return t.cast(str, response_data["snapshot_id"])
 
-class ResilientAdapter(cachecontrol.CacheControlAdapter):
-    """
-    An adapter which caches requests, and retries on errors.
+    def current_user_saved_tracks_contains(
+        self, tracks: list[str]
+    ) -> list[bool]:
+        """
+        Check if tracks are liked by the current user.
 
-    This adapter adds a timeout to each request.
-    """
+        Statuses are cached for SAVED_TRACKS_CACHE_TTL seconds, and the
+        remaining tracks are checked in batches of the API's id limit,
+        with up to SAVED_TRACKS_MAX_WORKERS batches checked at once.
+        """
+        now = time.monotonic()
+        statuses: dict[str, bool] = {}
+        to_fetch: list[str] = []
+
+        for track in dict.fromkeys(tracks):
+            cached = self.saved_tracks_cache.get(track)
+            if cached and now - cached[1] < self.SAVED_TRACKS_CACHE_TTL:
+                statuses[track] = cached[0]
+            else:
+                to_fetch.append(track)
+
+        batch_size = self.SAVED_TRACKS_BATCH_SIZE
+        batches = []
+        for start in range(0, len(to_fetch), batch_size):
+            end = start + batch_size
+            batches.append(to_fetch[start:end])
+
+        fetch_batch = super().current_user_saved_tracks_contains
+        if len(batches) > 1:
+            # The batches are independent, so their requests overlap.
+            # Rate limited (429) requests are retried by the session's
+            # ResilientAdapter, honouring Retry-After.
+            with ThreadPoolExecutor(
+                max_workers=self.SAVED_TRACKS_MAX_WORKERS
+            ) as executor:
+                results = list(executor.map(fetch_batch, batches))
+        else:
+            results = [fetch_batch(batch) for batch in batches]
+
+        for batch, saved in zip(batches, results):
+            for track, is_saved in zip(batch, saved):
+                statuses[track] = is_saved
+                self.saved_tracks_cache[track] = (is_saved, now)
+
+        if len(self.saved_tracks_cache) > self.SAVED_TRACKS_CACHE_MAX_SIZE:
+            self.saved_tracks_cache = {
+                track: cached
+                for track, cached in self.saved_tracks_cache.items()
+                if now - cached[1] < self.SAVED_TRACKS_CACHE_TTL
+            }
+
+        return [statuses[track] for track in tracks]
 
-    MAX_TIMEOUT = 2
-    DEFAULT_RETRY = urllib3.Retry(
-        total=5,
-        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
-        backoff_factor=0.3,
-        status_forcelist=frozenset([500, 502, 503, 504]),
-    )
+    def current_user_playlists(self) -> Playlists:
+        """Get a list of the playlists of the current user."""
+        response_data: ModelableJSON = super().current_user_playlists()
+        return Playlists(response_data)
 
-    def __init__(
-        self,
-        *args: t.Any,
-        max_timeout: t.Optional[float] = None,
-        **kwargs: t.Any
-    ) -> None:
+    def _current_user_cache_path(self) -> t.Optional[Path]:
         """
-        Initialise the adapter.
+        Get the path of the current user details cached on disk.
 
-        A max_timeout can be passed which applies to each request
-        which defaults to MAX_TIMEOUT.
-        If max_retries is not passed, it defaults to DEFAULT_RETRY.
+        The path is keyed by a hash of the refresh token, so different
+        accounts don't share the cache. None is returned if there's no
+        cached token to derive the key from.
         """
-        kwargs.setdefault("max_retries", self.DEFAULT_RETRY)
-        super().__init__(*args, **kwargs)
-        self.max_timeout = max_timeout or self.MAX_TIMEOUT
+        cache_handler = getattr(self.auth_manager, "cache_handler", None)
+        if cache_handler is None:
+            return None
 
-    def send(self, *args: t.Any, **kwargs: t.Any) -> requests.Response:
-        """
-        Send a request.
+        token_info = cache_handler.get_cached_token()
+        if not token_info or "refresh_token" not in token_info:
+            return None
 
-        If no timeout is passed, apply the default timeout.
-        """
-        kwargs.setdefault("timeout", self.max_timeout)
-        return super().send(*args, **kwargs)
+        refresh_token = token_info["refresh_token"].encode()
+        key = hashlib.sha256(refresh_token).hexdigest()[:16]
+        return CURRENT_USER_CACHE_DIR / f"{key}.json"
 
+    def current_user(self) -> CurrentUser:
+        """
+        Get detailed profile information about the current user.
 
-global_session = requests.Session()
-adapter = ResilientAdapter()
-global_session.mount("http://", adapter)
-global_session.mount("https://", adapter)
+        The information is cached in memory, and on disk for
+        CURRENT_USER_CACHE_TTL seconds so that it's shared across runs.
+        """
+        if self.current_user_details is not None:
+            return self.current_user_details
+
+        cache_path = self._current_user_cache_path()
+        cached_data = None
+        if cache_path is not None:
+            cached_data = read_json_if_fresh(
+                cache_path, CURRENT_USER_CACHE_TTL
+            )
+
+        if cached_data is None:
+            response_data: ModelableJSON = super().current_user()
+            if cache_path is not None:
+                try:
+                    atomic_write_bytes(
+                        cache_path, json.dumps(response_data).encode()
+                    )
+                except OSError:
+                    # The disk cache is only an optimisation.
+                    pass
+        else:
+            response_data = t.cast(ModelableJSON, cached_data)
+
+        self.current_user_details = CurrentUser(response_data)
+        return self.current_user_details
 
 
 def generate_global_instance() -> ModeledSpotify:
@@ -211,13 +382,26 @@ def generate_global_instance() -> ModeledSpotify:
     Get an appropriate instance of ModeledSpotify.
 
     This instance is used throughout the application.
+    Logging is setup before the instance is created.
+    The .env file is loaded here, since SpotifyOAuth reads its
+    credentials from the environment. Code creating a ModeledSpotify
+    directly needs to load the .env file itself.
     """
-    scopes = ",".join(SCOPES)
+    setup_logging()
+    dotenv.load_dotenv()
+
+    # cachecontrol is only imported once an instance is actually needed.
+    from spotils.helpers.session import ResilientAdapter, create_session
+
+    adapter = ResilientAdapter()
+    # The cached user details may belong to a revoked token.
+    adapter.unauthorized_callbacks.append(clear_current_user_cache)
+    session = create_session(adapter)
 
     # TODO: Let users configure whether the browser should be opened
-    return ModeledSpotify(
-        auth_manager=spotipy.SpotifyOAuth(
-            scope=scopes, requests_session=global_session
-        ),
-        requests_session=global_session,
+    auth_manager = MemoizedSpotifyOAuth(
+        scope=SCOPE_STRING, requests_session=session
     )
+    # The memoized token may have been revoked.
+    adapter.unauthorized_callbacks.append(auth_manager.clear_memoized_token)
+    return ModeledSpotify(auth_manager=auth_manager, requests_session=session)
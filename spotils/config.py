@@ -1,10 +1,12 @@
 """Allows accessing the JSON config values through classes."""
+import copy
 import json
 import os
+import threading
+import typing as t
 from importlib import resources
 
-from mergedeep import Strategy, merge
-
+from spotils.helpers.files import atomic_write_bytes
 from spotils.helpers.nested_key_mapping import ConfigMapping
 from spotils.meta import APPLICATION_PATHS
 from spotils.type_aliases import JSONVals
@@ -18,29 +20,79 @@ default_config_data = ConfigMapping()
 config_data = ConfigMapping()
 local_config_data = ConfigMapping()
 
+# The config is loaded on first use, see ensure_config_loaded.
+config_loaded = False
+_loading_lock = threading.Lock()
+
+
+def merge_config(
+    destination: t.MutableMapping[str, JSONVals],
+    source: t.Mapping[str, JSONVals],
+) -> None:
+    """
+    Recursively merge the source config into the destination.
+
+    Mappings present in both are merged, other values are replaced by
+    copies of the source's values.
+    A TypeError is raised if a value would be replaced by a value of a
+    different type.
+    """
+    for key, value in source.items():
+        if key not in destination:
+            destination[key] = copy.deepcopy(value)
+            continue
+
+        current = destination[key]
+        if type(current) is dict and type(value) is dict:
+            merge_config(current, value)
+        elif type(current) is not type(value):
+            raise TypeError(
+                f"Expected {key!r} to be of type {type(current).__name__},"
+                f" got {type(value).__name__}."
+            )
+        elif current is not value:
+            destination[key] = copy.deepcopy(value)
+
 
 def load_config_data() -> None:
     """
     Read the default and user config files and merge them.
 
-    The raw data stores in this module are updated.
+    The raw data stores in this module are updated, and the values
+    cached on the namespaces are cleared.
     """
-    default_config_data.update(
-        json.loads(DEFAULT_CONFIG_TRAVERSABLE.read_text())
-    )
+    if not USER_CONFIG_PATH.exists():
+        os.makedirs(USER_CONFIG_PATH.parent, exist_ok=True)
+        USER_CONFIG_PATH.write_bytes(json.dumps({}).encode())
+
+    # json decodes bytes itself, skipping a separate text decode.
+    default_data = json.loads(DEFAULT_CONFIG_TRAVERSABLE.read_bytes())
+    local_data = json.loads(USER_CONFIG_PATH.read_bytes())
+
+    default_config_data.update(default_data)
     config_data.update(default_config_data)
+    local_config_data.update(local_data)
+    merge_config(config_data, local_config_data)
+    clear_namespace_caches()
 
-    try:
-        with USER_CONFIG_PATH.open() as f:
-            local_config_data.update(json.load(f))
-    except FileNotFoundError:
-        os.makedirs(USER_CONFIG_PATH.parent, exist_ok=True)
-        with USER_CONFIG_PATH.open("w") as f:
-            json.dump({}, f)
-    else:
-        merge(
-            config_data, local_config_data, strategy=Strategy.TYPESAFE_REPLACE
-        )
+
+def ensure_config_loaded() -> None:
+    """
+    Load the config data if it hasn't been loaded yet.
+
+    Code reading the raw data stores directly needs to call this first,
+    the namespaces and the config setters call it themselves.
+    """
+    global config_loaded
+
+    if config_loaded:
+        return
+
+    with _loading_lock:
+        # Another thread may have loaded it while this one was waiting.
+        if not config_loaded:
+            load_config_data()
+            config_loaded = True
 
 
 class JsonLoaderMeta(type):
@@ -48,20 +100,21 @@ class JsonLoaderMeta(type):
 
     def __getattr__(cls, name: str) -> JSONVals:
         """
-        Use the class's section and subsection attributes to fetch vals.
+        Use the class's key prefix to fetch vals.
 
         name: the name of the actual key to fetch
-        The subsection is optional.
         """
-        section_name = cls.section
-        try:
-            # Avoid infinite recursion
-            subsection_name = object.__getattribute__(cls, "subsection")
-        except AttributeError:
-            keys = [section_name, name]
-        else:
-            keys = [section_name, subsection_name, name]
-        return config_data[keys]
+        ensure_config_loaded()
+        # vars avoids recursing into here while it isn't cached.
+        section_data = vars(cls).get("section_data")
+        if section_data is None:
+            section_data = config_data.resolve(cls.key_prefix)
+            type.__setattr__(cls, "section_data", section_data)
+
+        value = section_data[name]
+        # Later reads are served from the class dict, bypassing this.
+        type.__setattr__(cls, name, value)
+        return value
 
 
 class JsonLoader(metaclass=JsonLoaderMeta):
@@ -72,6 +125,21 @@ class JsonLoader(metaclass=JsonLoaderMeta):
     namespaces.
     """
 
+    # The keys leading to the namespace's values, built from the
+    # section and the optional subsection of each subclass.
+    key_prefix: tuple[str, ...] = ()
+    # The mapping at key_prefix is cached as section_data on first
+    # read, and cleared along with the cached values.
+    section_data: t.Mapping[str, JSONVals]
+
+    def __init_subclass__(cls, **kwargs: t.Any) -> None:
+        """Compute the key prefix of the namespace."""
+        super().__init_subclass__(**kwargs)
+        if "subsection" in vars(cls):
+            cls.key_prefix = (cls.section, cls.subsection)
+        else:
+            cls.key_prefix = (cls.section,)
+
 
 class Spotify(JsonLoader):
     """Namespace for the Spotify config section."""
@@ -134,18 +202,44 @@ class Log(JsonLoader):
     rotation: str
 
 
+def clear_namespace_caches() -> None:
+    """
+    Remove the config values cached on the namespace classes.
+
+    This needs to be called whenever the config data changes, so that
+    the namespaces don't serve stale values.
+    """
+    for namespace in JsonLoader.__subclasses__():
+        for name in list(vars(namespace)):
+            if name not in ("section", "subsection", "key_prefix") and not (
+                name.startswith("__") and name.endswith("__")
+            ):
+                delattr(namespace, name)
+
+
+def write_local_config() -> None:
+    """
+    Save the local config to the user config file.
+
+    The file is replaced atomically, so it's never left half written.
+    """
+    data = json.dumps(local_config_data, separators=(",", ":")).encode()
+    atomic_write_bytes(USER_CONFIG_PATH, data)
+
+
 def set_config_value(key_path: str, value: JSONVals) -> None:
     """Set a local config value and save it to the user config file."""
+    ensure_config_loaded()
     parent_keys, _ = ConfigMapping.split_key(key_path)
     current = local_config_data
     for parent_key in parent_keys:
-        if parent_key not in local_config_data:
+        if parent_key not in current:
             current[parent_key] = {}
         current = current[parent_key]
 
     local_config_data[key_path] = value
-    with USER_CONFIG_PATH.open("w") as f:
-        json.dump(local_config_data.data, f)
+    write_local_config()
+    clear_namespace_caches()
 
 
 def unset_config_key(key_path: str) -> None:
@@ -155,13 +249,20 @@ def unset_config_key(key_path: str) -> None:
     The value's parent dictionaries are also removed if they're
     empty after removal.
     """
-    del local_config_data[key_path]
-    remaining_keys = key_path.split(".")[:-1]
-
-    while remaining_keys:
-        if not local_config_data[remaining_keys]:
-            del local_config_data[remaining_keys]
-            remaining_keys.pop()
-
-    with USER_CONFIG_PATH.open("w") as f:
-        json.dump(local_config_data.data, f)
+    ensure_config_loaded()
+    parent_keys, key = ConfigMapping.split_key(key_path)
+    # parents[i] holds parent_keys[i], and each is only resolved once.
+    parents: list[t.MutableMapping[str, t.Any]] = [local_config_data]
+    for parent_key in parent_keys:
+        parents.append(parents[-1][parent_key])
+
+    del parents[-1][key]
+    for index in reversed(range(len(parent_keys))):
+        if parents[index + 1]:
+            break
+        del parents[index][parent_keys[index]]
+    # The nested dicts were modified directly, bypassing the mapping.
+    local_config_data.clear_flattened_caches()
+
+    write_local_config()
+    clear_namespace_caches()
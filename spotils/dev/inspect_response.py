@@ -1,9 +1,6 @@
 """View a pretty-formatted representation of a response's JSON."""
 import json
-import pprint
 
-import rich
-import rich.pretty
 from spotipy import Spotify
 
 from spotils import console, instance
@@ -17,6 +14,8 @@ depth = 2
 
 
 def print_response_data():
+    import rich.pretty
+
     pretty_data = rich.pretty.Pretty(
         response_data, max_depth=depth, expand_all=True
     )
@@ -25,13 +24,23 @@ def print_response_data():
 
 def dump_response_data(formatted=False):
     if formatted:
+        import pprint
+
         formatted_data = pprint.pformat(response_data, depth=depth)
 
         with open("dump.txt", "w") as f:
             f.write(formatted_data)
     else:
-        with open("dump.json", "w") as f:
-            json.dump(response_data, f, indent=4)
+        # orjson is much faster on large responses, but it's optional.
+        try:
+            import orjson
+        except ImportError:
+            data = json.dumps(response_data, indent=2).encode()
+        else:
+            data = orjson.dumps(response_data, option=orjson.OPT_INDENT_2)
+
+        with open("dump.json", "wb") as f:
+            f.write(data)
 
 
 # Comment this out to skip printing
@@ -9,7 +9,7 @@ import itertools
 import typing as t
 
 from spotils import config, console, instance
-from spotils.helpers.fetch_tracks import lazy_fetch_tracks
+from spotils.helpers.fetch_tracks import fetch_tracks
 from spotils.models import Track
 
 
@@ -22,21 +22,14 @@ class LikedSongsSyncer:
     def fetch_all_tracks(
         self, playlist_id: t.Optional[str] = None
     ) -> list[Track]:
-        return list(lazy_fetch_tracks(playlist_id))
+        return fetch_tracks(playlist_id)
 
     def populate_tracks(self, debug=False) -> None:
-        if debug:
-            self.insertion_id = config.Spotify.liked_songs_playlist_id
-            self.playlist_songs = self.fetch_all_tracks(self.insertion_id)
-            self.liked_songs = self.fetch_all_tracks(
-                config.Dev.reset_playlist_id
-            )
-            return
         self.insertion_id = config.Spotify.liked_songs_playlist_id
-        self.playlist_songs = self.fetch_all_tracks(
-            config.Spotify.liked_songs_playlist_id
+        self.playlist_songs = self.fetch_all_tracks(self.insertion_id)
+        self.liked_songs = self.fetch_all_tracks(
+            config.Dev.reset_playlist_id if debug else None
         )
-        self.liked_songs = self.fetch_all_tracks()
 
     @staticmethod
     def _get_corrected_opcodes(
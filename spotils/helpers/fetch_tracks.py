@@ -1,4 +1,5 @@
 """Helpers for fetching tracks from playlists and liked songs."""
+import contextlib
 import typing as t
 
 from spotils import instance
@@ -7,37 +8,42 @@ from spotils.models import PlaylistTracks, SavedTracks, Track
 TrackItems = t.Union[SavedTracks, PlaylistTracks]
 
 
-def lazy_fetch_tracks_from(
+def fetch_tracks_from(
     chunk: TrackItems, limit: t.Optional[int] = None
-) -> t.Iterator[Track]:
-    """Fetch the remaining tracks starting from the given chunk."""
-    fetched = 0
-    total = chunk.total
+) -> list[Track]:
+    """
+    Fetch the remaining tracks starting from the given chunk.
 
-    for track_info in chunk.items:
-        yield track_info.track
-        fetched += 1
-        if fetched == limit:
-            return
+    The next chunk is prefetched while the current one is consumed,
+    unless the limit is reached within the given chunk.
+    """
+    if limit is not None and limit <= len(chunk.items):
+        return [track_info.track for track_info in chunk.items[:limit]]
+
+    tracks: list[Track] = []
+    total = chunk.total
 
-    while chunk.next:
-        chunk = t.cast(TrackItems, instance.next(chunk))
+    # Closing the pages cancels the pending prefetch as soon as the
+    # limit is reached, instead of whenever the generator is collected.
+    with contextlib.closing(instance.iter_pages(chunk)) as pages:
+        for page in pages:
+            if page.total != total:
+                raise ValueError(
+                    "Total number of tracks changed while fetching the next"
+                    " batch."
+                )
 
-        if chunk.total != total:
-            raise ValueError(
-                "Total number of tracks changed while fetching the next batch."
-            )
+            tracks.extend([track_info.track for track_info in page.items])
+            if limit is not None and len(tracks) >= limit:
+                del tracks[limit:]
+                break
 
-        for track_info in chunk.items:
-            yield track_info.track
-            fetched += 1
-            if fetched == limit:
-                return
+    return tracks
 
 
-def lazy_fetch_tracks(
+def fetch_tracks(
     playlist_id: t.Optional[str] = None, limit: t.Optional[int] = None
-) -> t.Iterator[Track]:
+) -> list[Track]:
     """
     Fetch all the tracks from the playlist or liked songs.
 
@@ -48,4 +54,4 @@ def lazy_fetch_tracks(
     else:
         tracks = instance.playlist_tracks(playlist_id)
 
-    yield from lazy_fetch_tracks_from(tracks, limit)
+    return fetch_tracks_from(tracks, limit)
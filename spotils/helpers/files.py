@@ -0,0 +1,58 @@
+"""Helpers for reading and writing application files."""
+import json
+import os
+import stat
+import time
+import typing as t
+from pathlib import Path
+
+from spotils.type_aliases import JSONVals
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write data to a file atomically.
+
+    The data is written to a temporary file in the same directory which
+    then replaces the target file, so readers never see a partially
+    written file. Missing parent directories are created.
+    Symlinks are followed, so the file they point to is replaced, and
+    the permissions of an existing file are kept.
+    """
+    path = path.resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode: t.Optional[int] = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    temp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}.tmp")
+    # Unlike mkstemp's 0o600, this lets the umask decide the permissions
+    # of new files.
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            # The data has to reach the disk before the rename does.
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_json_if_fresh(path: Path, max_age: float) -> t.Optional[JSONVals]:
+    """
+    Read a JSON file if it was modified within max_age seconds.
+
+    None is returned if the file is missing, stale or isn't valid JSON.
+    """
+    try:
+        if time.time() - path.stat().st_mtime >= max_age:
+            return None
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
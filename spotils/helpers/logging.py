@@ -1,6 +1,7 @@
 """Project logging utilites."""
 import logging
 import sys
+import typing as t
 
 from loguru import logger
 
@@ -11,9 +12,21 @@ USER_LOG_PATH = (
     meta.APPLICATION_PATHS.user_log_path / f"{meta.__app_name__}.log"
 )
 
+_logging_configured = False
+
 
 class InterceptHandler(logging.Handler):
-    """Intercept logs from logging into loguru."""
+    """
+    Intercept logs from logging into loguru.
+
+    The frame depth of each call site is cached, since logging from the
+    same line goes through the same logging frames.
+    """
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Initialise the handler with an empty depth cache."""
+        super().__init__(*args, **kwargs)
+        self.caller_depths: dict[tuple[str, int], int] = {}
 
     def emit(self, record: logging.LogRecord) -> None:
         """Emit the actual logrecords into logger."""
@@ -24,15 +37,28 @@ class InterceptHandler(logging.Handler):
             level = record.levelno
 
         # Find caller from where originated the logged message.
-        frame, depth = sys._getframe(6), 6
-        while frame and frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
+        call_site = (record.pathname, record.lineno)
+        depth = self.caller_depths.get(call_site)
+        if depth is None or not self._is_call_site(depth + 1, call_site):
+            frame, depth = sys._getframe(6), 6
+            while frame and frame.f_code.co_filename == logging.__file__:
+                frame = frame.f_back
+                depth += 1
+            self.caller_depths[call_site] = depth
 
         logger.opt(depth=depth, exception=record.exc_info).log(
             level, record.getMessage()
         )
 
+    @staticmethod
+    def _is_call_site(depth: int, call_site: tuple[str, int]) -> bool:
+        """Check if the frame at depth is at the given call site."""
+        try:
+            frame = sys._getframe(depth)
+        except ValueError:
+            return False
+        return (frame.f_code.co_filename, frame.f_lineno) == call_site
+
 
 def setup_logging() -> None:
     """
@@ -40,7 +66,15 @@ def setup_logging() -> None:
 
     - Removes the preconfigured loguru logger.
     - Adds a handler for logging to a log file.
+
+    Only the first call configures logging, so this can be called from
+    every code path which produces logs.
     """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
     logging.basicConfig(
         handlers=[InterceptHandler()],
         level=logging.NOTSET,
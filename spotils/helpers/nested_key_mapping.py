@@ -1,6 +1,7 @@
 """A dictionary that allows nested key access with dot notation."""
 
-import collections
+import functools
+import sys
 import typing as t
 from collections.abc import Mapping
 
@@ -9,7 +10,19 @@ from spotils.type_aliases import JSONVals
 Key = t.Union[str, t.Iterable[str]]
 
 
-class ConfigMapping(collections.UserDict, t.MutableMapping[str, JSONVals]):
+@functools.lru_cache(maxsize=256)
+def split_dotted_key(key: str) -> tuple[str, ...]:
+    """
+    Split a dotted key into its parts.
+
+    The same few keys are looked up repeatedly, so the results are
+    cached. The parts are interned, so the same part of different keys
+    is a single string object.
+    """
+    return tuple(sys.intern(part) for part in key.split("."))
+
+
+class ConfigMapping(dict[str, JSONVals]):
     """
     A dictionary that allows nested key access with dot notation.
 
@@ -21,28 +34,35 @@ class ConfigMapping(collections.UserDict, t.MutableMapping[str, JSONVals]):
     Used for wrapping config data.
     """
 
+    FLATTENED_CACHES = ("flat_keys", "flat_keyset")
+
     @staticmethod
-    def split_key(key: Key) -> tuple[list[str], str]:
-        """Split a key into a list of keys and the last key."""
-        keys = list(ConfigMapping.get_keys(key))
-        last_key = keys.pop()
-        return keys, last_key
+    def split_key(key: Key) -> tuple[t.Sequence[str], str]:
+        """Split a key into a sequence of keys and the last key."""
+        keys = tuple(ConfigMapping.get_keys(key))
+        return keys[:-1], keys[-1]
 
     @staticmethod
     def get_keys(key: Key) -> t.Iterable[str]:
         """Get the actual list of keys for a key."""
         if isinstance(key, str):
-            return key.split(".")
+            return split_dotted_key(key)
         else:
             return key
 
     def resolve(self, key: Key) -> JSONVals:
-        """Resolve a key to its value."""
-        current = self.data
-        for actual_key in self.get_keys(key):
-            if not isinstance(current, Mapping):
-                raise KeyError(actual_key)
-            current = current[actual_key]
+        """
+        Resolve a key to its value.
+
+        A KeyError is raised if the key passes through a value which
+        isn't a mapping.
+        """
+        current: t.Any = self
+        try:
+            for actual_key in self.get_keys(key):
+                current = dict.__getitem__(current, actual_key)
+        except TypeError:
+            raise KeyError(key) from None
         return current
 
     def resolve_to_mapping(self, key: Key) -> t.MutableMapping[str, JSONVals]:
@@ -52,19 +72,75 @@ class ConfigMapping(collections.UserDict, t.MutableMapping[str, JSONVals]):
             raise TypeError(f"Expected {key} to be a mutable mapping.")
         return value
 
+    def walk(self) -> t.Iterator[tuple[str, JSONVals]]:
+        """
+        Iterate over the dotted keys of all the values, with the values.
+
+        Nested mappings are yielded before their own keys.
+        """
+        to_parse: list[tuple[str, Mapping]] = [("", self)]
+
+        while to_parse:
+            parent_key, value = to_parse.pop()
+
+            for subkey, subvalue in value.items():
+                new_key = f"{parent_key}.{subkey}" if parent_key else subkey
+                yield new_key, subvalue
+
+                if isinstance(subvalue, Mapping):
+                    to_parse.append((new_key, subvalue))
+
+    @functools.cached_property
+    def flat_keys(self) -> tuple[str, ...]:
+        """
+        The dotted keys of all the values which aren't mappings.
+
+        For example, {"a": {"b": 1}, "c": 2} has the keys "a.b" & "c".
+        The keys are computed once, and recomputed after the mapping is
+        modified through its own methods.
+        """
+        return tuple(
+            key for key, value in self.walk() if not isinstance(value, Mapping)
+        )
+
+    @functools.cached_property
+    def flat_keyset(self) -> frozenset[str]:
+        """
+        The dotted keys of all the values, including mappings.
+
+        For example, {"a": {"b": 1}} has the keys "a" & "a.b".
+        Checking membership here doesn't require resolving the key.
+        The set is recomputed after the mapping is modified through its
+        own methods.
+        """
+        return frozenset(key for key, _ in self.walk())
+
+    def clear_flattened_caches(self) -> None:
+        """Discard the cached flattened views of the mapping."""
+        for name in self.FLATTENED_CACHES:
+            self.__dict__.pop(name, None)
+
     def __getitem__(self, key: Key) -> JSONVals:
         return self.resolve(key)
 
     def __delitem__(self, key: Key) -> None:
         parent_keys, key = self.split_key(key)
-        del self.resolve_to_mapping(parent_keys)[key]
+        # The parent may be this mapping, so avoid recursing into it.
+        dict.__delitem__(self.resolve_to_mapping(parent_keys), key)
+        self.clear_flattened_caches()
 
     def __setitem__(self, key: Key, item: JSONVals) -> None:
         parent_keys, key = self.split_key(key)
-        self.resolve_to_mapping(parent_keys)[key] = item
+        dict.__setitem__(self.resolve_to_mapping(parent_keys), key, item)
+        self.clear_flattened_caches()
+
+    def update(self, *args: t.Any, **kwargs: t.Any) -> None:
+        """Update the top level keys, like dict.update."""
+        super().update(*args, **kwargs)
+        self.clear_flattened_caches()
 
     def __repr__(self) -> str:
-        return f"{type(self).__name__}({self.data!r})"
+        return f"{type(self).__name__}({dict.__repr__(self)})"
 
     def __contains__(self, key: Key) -> bool:
         try:
@@ -1,4 +1,5 @@
 """A scheduler for running tasks between interval."""
+import signal
 import threading
 import time
 import typing as t
@@ -6,11 +7,15 @@ import typing as t
 from schedule import Scheduler
 
 from spotils import config
+from spotils.helpers.logging import setup_logging
 from spotils.helpers.time import parse_interval
 from spotils.utils.cleanup_playlists import run_cleanup
 from spotils.utils.liked_songs_sync import LikedSongsSyncer
 from spotils.utils.skip_liked import skip_if_liked
 
+# The longest a task's thread sleeps before checking its scheduler.
+MAX_IDLE_SECONDS = 60
+
 
 def loop_task(
     interval: str, callback: t.Callable[..., object], *args: t.Any
@@ -24,6 +29,8 @@ def loop_task(
 
     This should be run inside a different thread as it blocks the
     current thread to run the pending tasks of the new scheduler.
+    Between runs, the thread sleeps until the task is next due, waking
+    up at least every MAX_IDLE_SECONDS.
     """
     scheduler = Scheduler()
     seconds = parse_interval(interval)
@@ -32,7 +39,10 @@ def loop_task(
 
     while True:
         scheduler.run_pending()
-        time.sleep(1)
+        idle_seconds = scheduler.idle_seconds
+        if idle_seconds is None:
+            idle_seconds = MAX_IDLE_SECONDS
+        time.sleep(min(max(idle_seconds, 0), MAX_IDLE_SECONDS))
 
 
 def schedule_task(
@@ -88,10 +98,10 @@ class LikedSongsSyncTick:
         required_decrement = long_seconds % short_seconds
 
         lowest_multiple = long_seconds // short_seconds
-        upper_interval = lowest_multiple + short_seconds
+        upper_interval = (lowest_multiple + 1) * short_seconds
         required_increment = upper_interval - long_seconds
 
-        if required_decrement > required_decrement:
+        if required_increment < required_decrement:
             long_seconds += required_increment
         else:
             long_seconds -= required_decrement
@@ -119,6 +129,8 @@ def run_tasks() -> None:
 
     Block the current thread indefinitely.
     """
+    setup_logging()
+
     if config.LikedSongsSync.enabled:
         if config.LikedSongsSync.short_sync_enabled:
             tick_syncer = LikedSongsSyncTick()
@@ -150,6 +162,11 @@ def run_tasks() -> None:
             run_cleanup,
         )
 
-    event = threading.Event()
-    # Sleep the main thread until all tasks finish.
-    event.wait()
+    # Sleep the main thread until all tasks finish, which they never do.
+    # signal.pause isn't available on Windows.
+    if hasattr(signal, "pause"):
+        while True:
+            # This returns after a signal is handled.
+            signal.pause()
+    else:
+        threading.Event().wait()
@@ -0,0 +1,83 @@
+"""Builds the requests session used for talking to Spotify."""
+import typing as t
+
+import cachecontrol
+import requests
+import requests.adapters
+import urllib3
+
+
+class ResilientAdapter(cachecontrol.CacheControlAdapter):
+    """
+    An adapter which caches requests, and retries on errors.
+
+    This adapter adds a timeout to each request.
+    The callbacks in unauthorized_callbacks are called whenever a
+    response has a 401 status, so that cached credential-dependent data
+    can be invalidated.
+    """
+
+    MAX_TIMEOUT = 2
+    DEFAULT_RETRY = urllib3.Retry(
+        total=5,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        backoff_factor=0.3,
+        # 429 responses are retried after their Retry-After header, or
+        # after the backoff if it's missing.
+        status_forcelist=frozenset([429, 500, 502, 503, 504]),
+    )
+
+    def __init__(
+        self,
+        *args: t.Any,
+        max_timeout: t.Optional[float] = None,
+        **kwargs: t.Any
+    ) -> None:
+        """
+        Initialise the adapter.
+
+        A max_timeout can be passed which applies to each request
+        which defaults to MAX_TIMEOUT.
+        If max_retries is not passed, it defaults to DEFAULT_RETRY.
+        """
+        kwargs.setdefault("max_retries", self.DEFAULT_RETRY)
+        super().__init__(*args, **kwargs)
+        self.max_timeout = max_timeout or self.MAX_TIMEOUT
+        self.unauthorized_callbacks: list[t.Callable[[], object]] = []
+
+    def send(self, *args: t.Any, **kwargs: t.Any) -> requests.Response:
+        """
+        Send a request.
+
+        If no timeout is passed, apply the default timeout.
+        """
+        kwargs.setdefault("timeout", self.max_timeout)
+        response = super().send(*args, **kwargs)
+
+        if response.status_code == 401:
+            for callback in self.unauthorized_callbacks:
+                callback()
+
+        return response
+
+
+API_URL_PREFIX = "https://api.spotify.com/"
+ACCOUNTS_URL_PREFIX = "https://accounts.spotify.com/"
+
+
+def create_session(adapter: ResilientAdapter) -> requests.Session:
+    """
+    Create a session which sends Web API requests via the adapter.
+
+    Requests for refreshing tokens are retried the same way, through
+    an adapter which doesn't cache their responses.
+    """
+    session = requests.Session()
+    session.mount(API_URL_PREFIX, adapter)
+    session.mount(
+        ACCOUNTS_URL_PREFIX,
+        requests.adapters.HTTPAdapter(
+            max_retries=ResilientAdapter.DEFAULT_RETRY
+        ),
+    )
+    return session
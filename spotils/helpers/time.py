@@ -1,18 +1,17 @@
 """Pretty printing time durations."""
 import datetime
-import re
+import functools
 import typing as t
 
-import arrow
 from dateutil.relativedelta import relativedelta
 
-_DURATION_REGEX = re.compile(
-    r"((?P<weeks>\d+?) ?(weeks|week|W|w) ?)?"
-    r"((?P<days>\d+?) ?(days|day|D|d) ?)?"
-    r"((?P<hours>\d+?) ?(hours|hour|H|h) ?)?"
-    r"((?P<minutes>\d+?) ?(minutes|minute|M|m) ?)?"
-    r"((?P<seconds>\d+?) ?(seconds|second|S|s))?"
-)
+# The units of a duration, in descending order of magnitude.
+_DURATION_UNITS = ("weeks", "days", "hours", "minutes", "seconds")
+_DURATION_UNIT_SYMBOLS = {
+    symbol: unit
+    for unit in _DURATION_UNITS
+    for symbol in (unit, unit[:-1], unit[0].upper(), unit[0])
+}
 
 
 def _stringify_time_unit(value: int, unit: str) -> str:
@@ -124,6 +123,7 @@ def time_since(
     return f"{time_between_now_and(past_datetime, precision, max_units)} ago"
 
 
+@functools.lru_cache(maxsize=32)
 def parse_duration_string(duration: str) -> t.Optional[relativedelta]:
     """
     Convert a `duration` string to a relativedelta object.
@@ -137,26 +137,93 @@ def parse_duration_string(duration: str) -> t.Optional[relativedelta]:
     The units need to be provided in descending order of magnitude.
     Return None if the `duration` string cannot be parsed according to
     the symbols above.
+    The results are cached, since the same few durations from the
+    config are parsed repeatedly. Every call with the same string
+    returns the same relativedelta object, so callers must not modify
+    it.
     """
-    match = _DURATION_REGEX.fullmatch(duration)
-    if not match:
-        return None
-
-    duration_dict = {
-        unit: int(amount)
-        for unit, amount in match.groupdict(default=0).items()
-    }
+    duration_dict = dict.fromkeys(_DURATION_UNITS, 0)
+    # The index of the smallest unit that may come next.
+    next_unit_index = 0
+    position = 0
+    length = len(duration)
+
+    # Each part is an amount, an optional space and a unit symbol.
+    # Every unit other than seconds may be followed by a space.
+    while position < length:
+        amount_start = position
+        while position < length and duration[position].isdecimal():
+            position += 1
+        if position == amount_start:
+            return None
+        amount = int(duration[amount_start:position])
+
+        if position < length and duration[position] == " ":
+            position += 1
+
+        symbol_start = position
+        while position < length and duration[position].isalpha():
+            position += 1
+        unit = _DURATION_UNIT_SYMBOLS.get(duration[symbol_start:position])
+        if unit is None:
+            return None
+
+        unit_index = _DURATION_UNITS.index(unit)
+        if unit_index < next_unit_index:
+            return None
+        next_unit_index = unit_index + 1
+        duration_dict[unit] = amount
+
+        if (
+            unit != "seconds"
+            and position < length
+            and duration[position] == " "
+        ):
+            position += 1
+
     delta = relativedelta(**duration_dict)
 
     return delta
 
 
 def relativedelta_to_timedelta(delta: relativedelta) -> datetime.timedelta:
-    """Convert a relativedelta object to a timedelta object."""
-    utcnow = arrow.utcnow()
+    """
+    Convert a relativedelta object to a timedelta object.
+
+    Deltas made of units with fixed lengths, like the ones parsed from
+    durations, are converted directly. Others are measured from now.
+    """
+    has_fixed_length = (
+        not (delta.years or delta.months or delta.leapdays)
+        and delta.weekday is None
+        and all(
+            getattr(delta, field) is None
+            for field in (
+                "year",
+                "month",
+                "day",
+                "hour",
+                "minute",
+                "second",
+                "microsecond",
+            )
+        )
+    )
+    if has_fixed_length:
+        # The days of a relativedelta include its weeks.
+        return datetime.timedelta(
+            days=delta.days,
+            hours=delta.hours,
+            minutes=delta.minutes,
+            seconds=delta.seconds,
+            microseconds=delta.microseconds,
+        )
+
+    utcnow = datetime.datetime.now(datetime.timezone.utc)
     return utcnow + delta - utcnow
 
 
+@functools.lru_cache(maxsize=32)
 def parse_interval(interval: str) -> int:
     """
     Convert `interval` into seconds.
@@ -170,6 +237,8 @@ def parse_interval(interval: str) -> int:
     The units need to be provided in descending order of magnitude.
     Return None if the `interval` string cannot be parsed according to
     the symbols above.
+    The results are cached, which is safe since the units are of fixed
+    lengths.
     """
     relativedelta = parse_duration_string(interval)
     if relativedelta:
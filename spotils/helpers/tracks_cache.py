@@ -4,10 +4,7 @@ import time
 import typing as t
 
 from spotils import instance
-from spotils.helpers.fetch_tracks import (
-    lazy_fetch_tracks,
-    lazy_fetch_tracks_from,
-)
+from spotils.helpers.fetch_tracks import fetch_tracks, fetch_tracks_from
 from spotils.models import Track
 
 
@@ -18,31 +15,67 @@ class PlaylistTracksCache:
     Snapshot ids are used to check if the playlist has changed.
     """
 
+    # The snapshot id isn't checked again within this many seconds.
+    CHECK_TTL = 10
+
     def __init__(self, playlist_id: str) -> None:
         """Tracks are stored in the tracks attribute."""
         self.playlist_id = playlist_id
         self.tracks: list[Track] = []
         self.lock = threading.Lock()
         self.latest_snapshot_id: t.Optional[str] = None
+        self.last_checked_at: t.Optional[float] = None
+
+    def mark_stale(self) -> None:
+        """
+        Make the next sync check the snapshot id again.
+
+        This should be called after modifying the playlist.
+        """
+        with self.lock:
+            self.last_checked_at = None
+
+    def set_tracks(self, tracks: list[Track], snapshot_id: str) -> None:
+        """
+        Replace the tracks with the playlist's tracks at snapshot_id.
+
+        This should be called after modifying the playlist, instead of
+        mark_stale, when the resulting tracks are known. The next sync
+        only re-fetches them if the snapshot id has changed since.
+        """
+        with self.lock:
+            self.tracks = tracks
+            self.latest_snapshot_id = snapshot_id
+            self.last_checked_at = None
 
     def sync_if_not_fresh(self, verify_validity: bool = True) -> None:
         """
         Sync the cache's tracks if the playlist has changed.
 
-        If verify_validity is True, the snapshot id is checked again
-        after syncing. If the playlist was changed while fetching,
-        a ValueError is raised.
+        The snapshot id isn't fetched if it was checked within
+        CHECK_TTL seconds.
+        If verify_validity is True and the tracks were synced, the
+        snapshot id is checked again. If the playlist was changed while
+        fetching, a ValueError is raised.
         """
         with self.lock:
+            if (
+                self.last_checked_at is not None
+                and time.monotonic() - self.last_checked_at < self.CHECK_TTL
+            ):
+                return
+
             details = instance.playlist(self.playlist_id)
             if details.snapshot_id != self.latest_snapshot_id:
-                self.tracks = list(lazy_fetch_tracks_from(details.tracks))
+                self.tracks = fetch_tracks_from(details.tracks)
                 self.latest_snapshot_id = details.snapshot_id
 
-            if verify_validity:
-                details = instance.playlist(self.playlist_id)
-                if details.snapshot_id != self.latest_snapshot_id:
-                    raise ValueError("Playlist changed while syncing.")
+                if verify_validity:
+                    details = instance.playlist(self.playlist_id)
+                    if details.snapshot_id != self.latest_snapshot_id:
+                        raise ValueError("Playlist changed while syncing.")
+
+            self.last_checked_at = time.monotonic()
 
 
 class LikedSongsCache:
@@ -51,16 +84,36 @@ class LikedSongsCache:
     def __init__(self) -> None:
         """Tracks are stored in the tracks attribute."""
         self.tracks: list[Track] = []
+        # lock guards the tracks and last_updated_at, sync_lock is held
+        # while fetching so that concurrent syncs don't fetch twice.
         self.lock = threading.Lock()
-        self.last_updated_at: t.Optional[float]
+        self.sync_lock = threading.Lock()
+        self.last_updated_at: t.Optional[float] = None
+
+    def _is_fresh_locked(self, threshold: int) -> bool:
+        """Check the freshness, the caller must hold lock."""
+        if self.last_updated_at is None:
+            return False
+
+        return time.perf_counter() - self.last_updated_at < threshold
+
+    def _sync_locked(self) -> None:
+        """
+        Fetch and replace the tracks, the caller must hold sync_lock.
+
+        The tracks are fetched without holding lock, which is only held
+        to replace them.
+        """
+        tracks = fetch_tracks()
+        updated_at = time.perf_counter()
+        with self.lock:
+            self.tracks = tracks
+            self.last_updated_at = updated_at
 
     def is_fresh(self, threshold: int) -> bool:
         """Return True if the cache was updated within the threshold."""
         with self.lock:
-            if self.last_updated_at is None:
-                return False
-
-            return time.perf_counter() - self.last_updated_at < threshold
+            return self._is_fresh_locked(threshold)
 
     def sync(self) -> None:
         """
@@ -68,15 +121,18 @@ class LikedSongsCache:
 
         last_updated_at is updated after syncing.
         """
-        with self.lock:
-            self.tracks = list(lazy_fetch_tracks())
-            self.last_updated_at = time.perf_counter()
+        with self.sync_lock:
+            self._sync_locked()
 
     def sync_if_not_fresh(self, threshold: int) -> None:
-        """Sync the cache's tracks if it's not fresh."""
-        with self.lock:
+        """
+        Sync the cache's tracks if it's not fresh.
+
+        Callers waiting on another sync don't sync again once it ends.
+        """
+        with self.sync_lock:
             if not self.is_fresh(threshold):
-                self.sync()
+                self._sync_locked()
 
 
 liked_songs_cache = LikedSongsCache()
@@ -1,11 +1,25 @@
 """Holds certain application metadata."""
-
-from importlib.metadata import metadata
+import typing as t
 
 import platformdirs
 
-package_metadata = metadata(__package__)
-__version__ = package_metadata["version"]
-__app_name__ = package_metadata["name"]
+# The distribution shares its name with the package.
+__app_name__ = "spotils"
 
 APPLICATION_PATHS = platformdirs.PlatformDirs(__app_name__, appauthor=False)
+
+
+def __getattr__(name: str) -> t.Any:
+    """
+    Look up the installed version on first access.
+
+    Reading the distribution's metadata scans sys.path, so it's only
+    done when the version is actually needed. The result is cached.
+    """
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib.metadata import version
+
+    value = globals()[name] = version(__app_name__)
+    return value
@@ -27,6 +27,11 @@ AtomicTypes = t.Union[
     t.Type[float],
 ]
 AtomicTypes_T = t.TypeVar("AtomicTypes_T", bound=AtomicTypes)
+ModelT = t.TypeVar("ModelT", bound=t.Type["Model"])
+
+# A field's name, the keys leading to it in the JSON data and the parser
+# of its value.
+FieldLoader = tuple[str, tuple[str, ...], t.Callable[[t.Any], t.Any]]
 
 
 class Model:
@@ -34,8 +39,14 @@ class Model:
     Mixin for spotify models which wrap API responses.
 
     This class shouldn't be instantiated.
-    The models which inherit this class should be dataclasses.
-    The model's dataclass fields are used to load the JSON data.
+    The models which inherit this class should be dataclasses created
+    with model_dataclass. The model's dataclass fields are used to load
+    the JSON data, through the FIELD_LOADERS which model_dataclass
+    builds from them once per class.
+    Model instances are created for every item of every fetched page,
+    so no class in the hierarchy should have a __dict__: abstract
+    models define empty __slots__ and model_dataclass adds the slots of
+    the fields.
     """
 
     __slots__ = ()
@@ -43,24 +54,14 @@ class Model:
     DATA_PATHS: t.ClassVar[t.Mapping[str, str]] = {
         "url": "external_urls.spotify",
     }
-
-    def _resolve_path(self, path: str, data: ModelableJSON) -> JSONVals:
-        """
-        Access a mapping value from a path in the form of "a.b.c".
-
-        "a.b.c" resolves to data["a"]["b"]["c"].
-        """
-        for key in path.split("."):
-            data = data[key]  # type: ignore
-        return t.cast(JSONVals, data)
+    FIELD_LOADERS: t.ClassVar[tuple[FieldLoader, ...]] = ()
 
     @staticmethod
-    def _parse_atomic_types(
+    def _atomic_type_parser(
         target_type: AtomicTypes_T,
-        value: JSONVals,
-    ) -> AtomicTypes_T:
+    ) -> t.Callable[[JSONVals], AtomicTypes_T]:
         """
-        Convert the value to simple types and models.
+        Get a function converting values to simple types and models.
 
         If the target_type is a model, the value is passed to the model.
         If the target_type is a simple json type, the type of the value
@@ -68,21 +69,27 @@ class Model:
         target type.
         """
         if issubclass(target_type, Model):
-            return target_type(value)
+            return target_type
+
         if issubclass(target_type, (str, bool, int, float, NoneType)):
-            if type(value) != target_type:
-                raise TypeError(
-                    f"Expected {target_type}, got {type(value)}: {value}"
-                )
-            return value
+
+            def parse_simple_value(value: JSONVals) -> AtomicTypes_T:
+                if type(value) != target_type:
+                    raise TypeError(
+                        f"Expected {target_type}, got {type(value)}: {value}"
+                    )
+                return value
+
+            return parse_simple_value
 
         raise TypeError(f"Invalid type: {target_type}.")
 
-    def _load_field_value(
-        self, field: dataclasses.Field, data: ModelableJSON
-    ) -> None:
+    @classmethod
+    def _field_loader(
+        cls: t.Type["Model"], field: dataclasses.Field
+    ) -> FieldLoader:
         """
-        Load a model's field's value given the response data.
+        Build the loader for a model's field.
 
         The field's type-hint is used to convert the value.
         Expected type-hints:
@@ -91,34 +98,43 @@ class Model:
             - list[model & simple types]
             - t.Optional[all of the types mentioned above]
         """
-        # The path is the field's own name if it's not specified
-        path = self.DATA_PATHS.get(field.name, field.name)
-        value = self._resolve_path(path, data)
+        # The path is the field's own name if it's not specified.
+        # A path in the form of "a.b.c" resolves to data["a"]["b"]["c"].
+        path = tuple(cls.DATA_PATHS.get(field.name, field.name).split("."))
+        parse: t.Callable[[t.Any], t.Any]
 
         # Handling Optional types, since they're just Unions
         if t.get_origin(field.type) == t.Union:
             # The actual type of t.Optional[int] is int
             type1, type2 = t.get_args(field.type)
             actual_type = type1 if type1 != NoneType else type2
-            if value is not None:
-                value = self._parse_atomic_types(actual_type, value)
+            parse_actual = cls._atomic_type_parser(actual_type)
+
+            def parse(value: JSONVals) -> t.Any:
+                return None if value is None else parse_actual(value)
+
         elif t.get_origin(field.type) == tuple:
             # The actual type of tuple[int] is int
             actual_type = t.get_args(field.type)[0]
-            value = tuple(
-                self._parse_atomic_types(actual_type, obj) for obj in value
-            )
+            parse_item = cls._atomic_type_parser(actual_type)
+
+            def parse(value: JSONVals) -> t.Any:
+                return tuple(map(parse_item, value))
+
         else:
             # The model needs to be instantiated with the inner
             # response data
-            value = self._parse_atomic_types(field.type, value)
+            parse = cls._atomic_type_parser(field.type)
 
-        object.__setattr__(self, field.name, value)
+        return field.name, path, parse
 
     def __init__(self, data: ModelableJSON) -> None:
         """Load the data for all the fields from the JSON data."""
-        for field in dataclasses.fields(self):
-            self._load_field_value(field, data)
+        for name, path, parse in self.FIELD_LOADERS:
+            value: t.Any = data
+            for key in path:
+                value = value[key]
+            object.__setattr__(self, name, parse(value))
 
 
 class PagedModel(Model):
@@ -129,12 +145,54 @@ class PagedModel(Model):
     next: t.Optional[str]
 
 
-model_dataclass = dataclasses.dataclass(
-    slots=True,
-    eq=True,
-    init=False,
-    frozen=True,
-)
+def generate_init(
+    loaders: tuple[FieldLoader, ...]
+) -> t.Callable[[Model, ModelableJSON], None]:
+    """
+    Generate an __init__ which loads the fields of the given loaders.
+
+    The generated function is equivalent to Model.__init__, with the
+    loop over the loaders and their paths unrolled into one statement
+    per field.
+    """
+    namespace: dict[str, t.Any] = {"setattr": object.__setattr__}
+    lines = ["def __init__(self, data):"]
+    for name, path, parse in loaders:
+        namespace[f"parse_{name}"] = parse
+        lookup = "".join(f"[{key!r}]" for key in path)
+        lines.append(
+            f"    setattr(self, {name!r}, parse_{name}(data{lookup}))"
+        )
+    if len(lines) == 1:
+        lines.append("    pass")
+
+    exec("\n".join(lines), namespace)
+    return namespace["__init__"]
+
+
+def model_dataclass(cls: ModelT) -> ModelT:
+    """
+    Turn a model class into a dataclass, and build its field loaders.
+
+    The loaders are only built once here, instead of inspecting the
+    type-hints of the fields for every model instance, and compiled
+    into the class's __init__.
+    """
+    # slots=True keeps model instances small and attribute access fast.
+    cls = dataclasses.dataclass(
+        slots=True,
+        eq=True,
+        init=False,
+        frozen=True,
+    )(cls)
+    cls.FIELD_LOADERS = tuple(
+        cls._field_loader(field) for field in dataclasses.fields(cls)
+    )
+    init = generate_init(cls.FIELD_LOADERS)
+    init.__qualname__ = f"{cls.__qualname__}.__init__"
+    init.__doc__ = Model.__init__.__doc__
+    cls.__init__ = init
+    return cls
 
 
 @model_dataclass
@@ -1,19 +1,19 @@
 """Removes empty "My Playlist #n" playlists from Spotify."""
-
-import typing as t
+from concurrent.futures import ThreadPoolExecutor
 
 from spotils import instance
-from spotils.models import Playlists, SimplePlaylist
+from spotils.models import SimplePlaylist
+
+# Kept low to stay well within Spotify's rate limits.
+MAX_CONCURRENT_UNFOLLOWS = 4
 
 
 def fetch_playlists() -> list[SimplePlaylist]:
     """Fetch all the playlists of the current user."""
     playlists: list[SimplePlaylist] = []
-    chunk = instance.current_user_playlists()
-    playlists.extend(chunk.items)
+    first_chunk = instance.current_user_playlists()
 
-    while chunk.next:
-        chunk = t.cast(Playlists, instance.next(chunk))
+    for chunk in instance.iter_pages(first_chunk):
         playlists.extend(chunk.items)
 
     return playlists
@@ -25,14 +25,28 @@ def run_cleanup() -> None:
 
     Doesn't remove playlists that are not owned by the current user or
     ones that have a non-empty description.
+    The playlists are unfollowed concurrently.
     """
+    to_unfollow: list[str] = []
+    current_user_id = instance.current_user().id
+
     for playlist in fetch_playlists():
+        # Most playlists fail the name check, so it's done first.
         should_delete = (
-            playlist.owner
-            and playlist.owner.id == instance.current_user().id
-            and playlist.name.startswith("My Playlist #")
+            playlist.name.startswith("My Playlist #")
             and playlist.tracks.total == 0
             and playlist.description == ""
+            and playlist.owner
+            and playlist.owner.id == current_user_id
         )
         if should_delete:
-            instance.current_user_unfollow_playlist(playlist.id)
+            to_unfollow.append(playlist.id)
+
+    if not to_unfollow:
+        return
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UNFOLLOWS) as executor:
+        # Consuming the results re-raises the errors of failed requests.
+        list(
+            executor.map(instance.current_user_unfollow_playlist, to_unfollow)
+        )
@@ -1,11 +1,12 @@
 """Mirrors the currently liked songs into a different playlist."""
-import difflib
-import itertools
+import bisect
+import collections
 import threading
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 
 from spotils import config, instance
-from spotils.helpers.fetch_tracks import lazy_fetch_tracks
+from spotils.helpers.fetch_tracks import fetch_tracks
 from spotils.helpers.tracks_cache import PlaylistTracksCache, liked_songs_cache
 from spotils.models import Track
 
@@ -19,6 +20,9 @@ class LikedSongsSyncer:
     multiple threads it's recommended to only use a single instance.
     """
 
+    # The API accepts upto 100 items when adding or removing items.
+    CHUNK_SIZE = 100
+
     def __init__(self) -> None:
         """
         Initialise the syncer.
@@ -26,18 +30,28 @@ class LikedSongsSyncer:
         sync_lock is aquired during ongoing syncs.
         current_snapshot_id holds the latest snapshot id obtained after
         inserting a track.
+        latest_snapshot_id holds the snapshot id returned by the last
+        request which changed the playlist during the current sync.
         playlist_songs & liked_songs hold the current state of the
         respective caches for use in the various methods that
         manipulate the playlist.
+        playlist_ids & liked_ids hold the ids of those tracks, and are
+        kept in step with them.
         They're only in use while syncing.
+        has_all_playlist_songs is False during short syncs, when
+        playlist_songs only holds the first few tracks of the playlist.
         """
         self.current_snapshot_id = None
+        self.latest_snapshot_id: t.Optional[str] = None
         self.sync_lock = threading.Lock()
         self.playlist_cache = PlaylistTracksCache(
             config.Spotify.liked_songs_playlist_id
         )
         self.playlist_songs: list[Track] = []
         self.liked_songs: list[Track] = []
+        self.playlist_ids: list[str] = []
+        self.liked_ids: list[str] = []
+        self.has_all_playlist_songs = False
 
     def populate_tracks(self, limit: t.Optional[int] = None) -> None:
         """
@@ -45,42 +59,184 @@ class LikedSongsSyncer:
 
         A limit is supplied for short syncs, in which case the cache's
         aren't updated.
+        Both lists are independent, so they're fetched concurrently.
         """
-        if limit is None:
-            liked_songs_cache.sync()
-            self.playlist_cache.sync_if_not_fresh()
-            self.liked_songs = liked_songs_cache.tracks.copy()
-            self.playlist_songs = self.playlist_cache.tracks.copy()
-        else:
-            self.liked_songs = list(lazy_fetch_tracks(limit=limit))
-            self.playlist_songs = list(
-                lazy_fetch_tracks(
-                    config.Spotify.liked_songs_playlist_id, limit=limit
+        self.has_all_playlist_songs = limit is None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if limit is None:
+                liked_future = executor.submit(liked_songs_cache.sync)
+                playlist_future = executor.submit(
+                    self.playlist_cache.sync_if_not_fresh
                 )
-            )
+                liked_future.result()
+                playlist_future.result()
+                # The cache replaces its list on every sync instead of
+                # mutating it, and liked_songs is only ever read, so
+                # it's shared. playlist_songs is modified while syncing.
+                self.liked_songs = liked_songs_cache.tracks
+                self.playlist_songs = self.playlist_cache.tracks.copy()
+            else:
+                liked_future = executor.submit(fetch_tracks, limit=limit)
+                playlist_future = executor.submit(
+                    fetch_tracks,
+                    config.Spotify.liked_songs_playlist_id,
+                    limit=limit,
+                )
+                self.liked_songs = liked_future.result()
+                self.playlist_songs = playlist_future.result()
+
+        self.liked_ids = [track.id for track in self.liked_songs]
+        self.playlist_ids = [track.id for track in self.playlist_songs]
 
     @staticmethod
-    def _get_corrected_opcodes(
+    def _match_unique_items(
         a: t.Sequence[t.Hashable], b: t.Sequence[t.Hashable]
+    ) -> list[tuple[int, int]]:
+        """
+        Match the items which appear exactly once in both sequences.
+
+        The longest list of matches in the order of both sequences is
+        returned, as pairs of the item's index in a and in b.
+        It's found as the longest increasing subsequence of the a
+        indexes, ordered by the b indexes.
+        """
+        a_counts = collections.Counter(a)
+        b_counts = collections.Counter(b)
+        a_indexes = {
+            item: index for index, item in enumerate(a) if a_counts[item] == 1
+        }
+        pairs = [
+            (a_indexes[item], index)
+            for index, item in enumerate(b)
+            if b_counts[item] == 1 and item in a_indexes
+        ]
+
+        # tails[k] is the pair ending the increasing subsequence of
+        # length k + 1 with the smallest a index, tail_indexes[k] holds
+        # that a index.
+        tails: list[int] = []
+        tail_indexes: list[int] = []
+        previous: list[t.Optional[int]] = []
+        for pair_index, (a_index, _) in enumerate(pairs):
+            length = bisect.bisect_left(tail_indexes, a_index)
+            previous.append(tails[length - 1] if length else None)
+            if length == len(tails):
+                tails.append(pair_index)
+                tail_indexes.append(a_index)
+            else:
+                tails[length] = pair_index
+                tail_indexes[length] = a_index
+
+        matches = []
+        current = tails[-1] if tails else None
+        while current is not None:
+            matches.append(pairs[current])
+            current = previous[current]
+        matches.reverse()
+        return matches
+
+    @classmethod
+    def _get_opcodes(
+        cls: t.Type["LikedSongsSyncer"],
+        a: t.Sequence[t.Hashable],
+        b: t.Sequence[t.Hashable],
+    ) -> list[tuple[str, int, int, int, int]]:
+        """
+        Get the opcodes to turn a into b, like SequenceMatcher.
+
+        The unique items matched by _match_unique_items anchor the diff,
+        and equal items around each anchor are matched as well. The
+        remaining items between two anchors are replaced, deleted or
+        inserted.
+        This runs in O(n log n), unlike SequenceMatcher which is
+        quadratic on long sequences.
+        """
+        # A first sync starts from an empty playlist, and nothing needs
+        # to be matched then.
+        if not a or not b:
+            if a:
+                return [("delete", 0, len(a), 0, 0)]
+            if b:
+                return [("insert", 0, 0, 0, len(b))]
+            return []
+
+        opcodes: list[tuple[str, int, int, int, int]] = []
+
+        def add(tag: str, i1: int, i2: int, j1: int, j2: int) -> None:
+            if i1 == i2 and j1 == j2:
+                return
+            if tag == "equal" and opcodes and opcodes[-1][0] == "equal":
+                i1, j1 = opcodes.pop()[1::2]
+            opcodes.append((tag, i1, i2, j1, j2))
+
+        a_start = b_start = 0
+        anchors = cls._match_unique_items(a, b)
+        anchors.append((len(a), len(b)))
+        for a_anchor, b_anchor in anchors:
+            a_end, b_end = a_start, b_start
+            while (
+                a_end < a_anchor and b_end < b_anchor and a[a_end] == b[b_end]
+            ):
+                a_end += 1
+                b_end += 1
+            add("equal", a_start, a_end, b_start, b_end)
+            a_start, b_start = a_end, b_end
+
+            a_end, b_end = a_anchor, b_anchor
+            while (
+                a_end > a_start
+                and b_end > b_start
+                and a[a_end - 1] == b[b_end - 1]
+            ):
+                a_end -= 1
+                b_end -= 1
+            if a_start < a_end and b_start < b_end:
+                add("replace", a_start, a_end, b_start, b_end)
+            elif a_start < a_end:
+                add("delete", a_start, a_end, b_start, b_end)
+            else:
+                add("insert", a_start, a_end, b_start, b_end)
+            add("equal", a_end, a_anchor, b_end, b_anchor)
+
+            if a_anchor < len(a):
+                add("equal", a_anchor, a_anchor + 1, b_anchor, b_anchor + 1)
+            a_start, b_start = a_anchor + 1, b_anchor + 1
+
+        return opcodes
+
+    @classmethod
+    def _get_corrected_opcodes(
+        cls: t.Type["LikedSongsSyncer"],
+        a: t.Sequence[t.Hashable],
+        b: t.Sequence[t.Hashable],
     ) -> t.Iterator[tuple[str, int, int, int, int]]:
         """
-        Fix the indexes returned by SequenceMatcher.get_opcodes.
+        Get opcodes with indexes into a as it's being updated.
 
         This function assumes that you are updating sequence a based on
         the produced opcodes. And thus subsequent indexes are updated
-        based on the state of a.
-        """
-        matcher = difflib.SequenceMatcher(a=a, b=b, autojunk=False)
-        delta = 0
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-            yield (tag, i1 + delta, i2 + delta, j1, j2)
-            if tag == "delete":
-                delta -= i2 - i1
-            elif tag == "insert":
-                delta += j2 - j1
-            elif tag == "replace":
-                delta -= i2 - i1
-                delta += j2 - j1
+        based on the state of a. Since every earlier opcode has made a
+        match b up to j1 by then, an opcode's range in a starts at j1.
+
+        The common prefix and suffix are skipped before diffing, since
+        syncs usually only change a few tracks. No opcodes are produced
+        for them.
+        """
+        shortest = min(len(a), len(b))
+        prefix = 0
+        while prefix < shortest and a[prefix] == b[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shortest - prefix and a[-1 - suffix] == b[-1 - suffix]:
+            suffix += 1
+
+        a_end = len(a) - suffix
+        b_end = len(b) - suffix
+        for tag, i1, i2, j1, j2 in cls._get_opcodes(
+            a[prefix:a_end], b[prefix:b_end]
+        ):
+            start = j1 + prefix
+            yield (tag, start, start + i2 - i1, start, j2 + prefix)
 
     def chunked_insert(self, p_start: int, l_start: int, l_end: int) -> None:
         """
@@ -88,22 +244,26 @@ class LikedSongsSyncer:
 
         Insertions are done in chunks.
         playlist_songs is updated to reflect the new state.
-        current_snapshot_id is updated to the newly returned snapshot
-        id.
+        current_snapshot_id and latest_snapshot_id are updated to the
+        newly returned snapshot id.
         """
-        to_insert = self.liked_songs[l_start:l_end]
-        iterators = [iter(to_insert)] * 100
-
+        to_insert = self.liked_ids[l_start:l_end]
+        playlist_id = config.Spotify.liked_songs_playlist_id
         insertion_position = p_start
 
-        for chunk in itertools.zip_longest(*iterators, fillvalue=None):
-            track_ids = [track.id for track in chunk if track]
+        # The chunks must be sent one after another, since each position
+        # is only valid once the previous chunks have been inserted.
+        # Concurrent requests could be applied out of order.
+        for start in range(0, len(to_insert), self.CHUNK_SIZE):
+            end = start + self.CHUNK_SIZE
+            track_ids = to_insert[start:end]
 
             self.current_snapshot_id = instance.playlist_add_items(
-                config.Spotify.liked_songs_playlist_id,
+                playlist_id,
                 track_ids,
                 insertion_position,
             )
+            self.latest_snapshot_id = self.current_snapshot_id
             # FIXME: snapshot ids don't work when deleting subsequently
             #  from the same snapshot id. Might need to fix
             # indexes in that case. As such, we shouldn't use
@@ -111,7 +271,8 @@ class LikedSongsSyncer:
             self.current_snapshot_id = None
             insertion_position += len(track_ids)
 
-        self.playlist_songs[p_start:p_start] = to_insert
+        self.playlist_songs[p_start:p_start] = self.liked_songs[l_start:l_end]
+        self.playlist_ids[p_start:p_start] = to_insert
 
     def chunked_delete(self, p_start: int, p_end: int) -> None:
         """
@@ -122,21 +283,28 @@ class LikedSongsSyncer:
         on the last insertion state.
         playlist_songs is updated to reflect the new state.
         """
-        iterators = [iter(self.playlist_songs[p_start:p_end])] * 100
+        to_delete = self.playlist_ids[p_start:p_end]
+        playlist_id = config.Spotify.liked_songs_playlist_id
 
-        for chunk in itertools.zip_longest(*iterators, fillvalue=None):
-            data = []
-            for ahead_by, track in enumerate(filter(None, chunk)):
-                data.append(
-                    {"uri": track.id, "positions": [p_start + ahead_by]}
+        for start in range(0, len(to_delete), self.CHUNK_SIZE):
+            end = start + self.CHUNK_SIZE
+            # The previous chunks have been removed by now, so every
+            # chunk starts at p_start. For the same reason, chunks can't
+            # be removed concurrently.
+            data = [
+                {"uri": track_id, "positions": [p_start + ahead_by]}
+                for ahead_by, track_id in enumerate(to_delete[start:end])
+            ]
+            self.latest_snapshot_id = (
+                instance.playlist_remove_specific_occurrences_of_items(
+                    playlist_id,
+                    data,
+                    self.current_snapshot_id,
                 )
-            instance.playlist_remove_specific_occurrences_of_items(
-                config.Spotify.liked_songs_playlist_id,
-                data,
-                self.current_snapshot_id,
             )
 
         del self.playlist_songs[p_start:p_end]
+        del self.playlist_ids[p_start:p_end]
 
     def chunked_replace(
         self, p_start: int, p_end: int, l_start: int, l_end: int
@@ -148,10 +316,145 @@ class LikedSongsSyncer:
         liked_songs items from l_start to l_end.
 
         Operations are performed in chunks.
+        If every track of the playlist is replaced, the first chunk
+        replaces them in a single request instead of deleting them.
+        playlist_songs is updated to reflect the new state.
+        """
+        if not (
+            self.has_all_playlist_songs
+            and p_start == 0
+            and p_end == len(self.playlist_ids)
+        ):
+            self.chunked_delete(p_start, p_end)
+            self.chunked_insert(p_start, l_start, l_end)
+            return
+
+        first_end = min(l_start + self.CHUNK_SIZE, l_end)
+        self.latest_snapshot_id = instance.playlist_replace_items(
+            config.Spotify.liked_songs_playlist_id,
+            self.liked_ids[l_start:first_end],
+        )
+        self.playlist_songs[:] = self.liked_songs[l_start:first_end]
+        self.playlist_ids[:] = self.liked_ids[l_start:first_end]
+        self.chunked_insert(first_end - l_start, first_end, l_end)
+
+    def _get_moves(
+        self, max_moves: int
+    ) -> t.Optional[list[tuple[int, int, int]]]:
+        """
+        Get the moves which reorder playlist_ids to match liked_ids.
+
+        Both need to hold the same tracks. Each position is fixed in
+        order, by moving the longest run of tracks which belongs there.
+        The moves are returned as (range_start, insert_before,
+        range_length), as the reorder endpoint expects them.
+        None is returned as soon as more than max_moves are needed.
+
+        The reordered list isn't built. The tracks which aren't in place
+        yet always follow the placed ones in their original order, so a
+        track's current index is the number of placed tracks plus the
+        number of unplaced tracks before it in the original order.
+        """
+        ids = self.playlist_ids
+        size = len(ids)
+        # A Fenwick tree counting the placed tracks by original index.
+        placed_tree = [0] * (size + 1)
+        placed = bytearray(size)
+        # next_unplaced[i] leads to the first unplaced index from i on.
+        next_unplaced = list(range(size + 1))
+        occurrences: dict[str, collections.deque[int]] = {}
+        for index, track_id in enumerate(ids):
+            occurrences.setdefault(track_id, collections.deque()).append(index)
+
+        def place(index: int) -> None:
+            placed[index] = 1
+            next_unplaced[index] = index + 1
+            node = index + 1
+            while node <= size:
+                placed_tree[node] += 1
+                node += node & -node
+
+        def placed_before(index: int) -> int:
+            count = 0
+            while index:
+                count += placed_tree[index]
+                index -= index & -index
+            return count
+
+        def find_unplaced(index: int) -> int:
+            root = index
+            while next_unplaced[root] != root:
+                root = next_unplaced[root]
+            while next_unplaced[index] != root:
+                next_unplaced[index], index = root, next_unplaced[index]
+            return root
+
+        moves = []
+        position = 0
+        while position < size:
+            first = find_unplaced(0)
+            if ids[first] == self.liked_ids[position]:
+                place(first)
+                position += 1
+                continue
+
+            # The first unplaced occurrence, like list.index would find.
+            candidates = occurrences[self.liked_ids[position]]
+            while placed[candidates[0]]:
+                candidates.popleft()
+            start = candidates.popleft()
+            current_start = position + start - placed_before(start)
+
+            place(start)
+            length = 1
+            index = find_unplaced(start + 1)
+            while (
+                index < size
+                and position + length < size
+                and ids[index] == self.liked_ids[position + length]
+            ):
+                place(index)
+                length += 1
+                index = find_unplaced(index + 1)
+
+            moves.append((current_start, position, length))
+            if len(moves) > max_moves:
+                return None
+            position += length
+
+        return moves
+
+    def _count_requests(
+        self, opcodes: list[tuple[str, int, int, int, int]]
+    ) -> int:
+        """Count the requests needed to apply the opcodes in chunks."""
+        requests = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag in ("replace", "delete"):
+                requests += -(-(i2 - i1) // self.CHUNK_SIZE)
+            if tag in ("replace", "insert"):
+                requests += -(-(j2 - j1) // self.CHUNK_SIZE)
+        return requests
+
+    def reorder(self, moves: list[tuple[int, int, int]]) -> None:
+        """
+        Move ranges of playlist_songs items, as given by _get_moves.
+
+        Moved tracks keep the date they were added to the playlist,
+        unlike when they're deleted and inserted again.
         playlist_songs is updated to reflect the new state.
         """
-        self.chunked_delete(p_start, p_end)
-        self.chunked_insert(p_start, l_start, l_end)
+        playlist_id = config.Spotify.liked_songs_playlist_id
+
+        for start, position, length in moves:
+            self.latest_snapshot_id = instance.playlist_reorder_items(
+                playlist_id, start, position, length
+            )
+            end = start + length
+            for mirror in (self.playlist_songs, self.playlist_ids):
+                moved = mirror[start:end]
+                del mirror[start:end]
+                mirror[position:position] = moved
 
     def _sync_playlist(self, limit: t.Optional[int] = None) -> None:
         """
@@ -160,18 +463,57 @@ class LikedSongsSyncer:
         By the end of this, playlist_songs and liked_songs are equal.
         """
         self.populate_tracks(limit)
+        self.latest_snapshot_id = None
+        # Most syncs have nothing to change, which this checks quickly.
+        if self.playlist_ids == self.liked_ids:
+            return
 
-        for tag, i1, i2, j1, j2 in self._get_corrected_opcodes(
-            self.playlist_songs, self.liked_songs
+        # Track ids are much cheaper to hash and compare than the
+        # models, and the playlist only needs to match them anyway.
+        opcodes = list(
+            self._get_corrected_opcodes(self.playlist_ids, self.liked_ids)
+        )
+        # If the liked songs were only reordered, the tracks can be
+        # moved instead, unless so many moved that it takes more
+        # requests.
+        moves = None
+        if collections.Counter(self.playlist_ids) == collections.Counter(
+            self.liked_ids
         ):
-            if tag == "replace":
-                self.chunked_replace(i1, i2, j1, j2)
-            elif tag == "delete":
-                self.chunked_delete(i1, i2)
-            elif tag == "insert":
-                self.chunked_insert(i1, j1, j2)
+            moves = self._get_moves(self._count_requests(opcodes))
 
-        self.current_snapshot_id = None
+        synced = False
+        try:
+            if moves is not None:
+                self.reorder(moves)
+                opcodes = []
+
+            for tag, i1, i2, j1, j2 in opcodes:
+                if tag == "replace":
+                    self.chunked_replace(i1, i2, j1, j2)
+                elif tag == "delete":
+                    self.chunked_delete(i1, i2)
+                elif tag == "insert":
+                    self.chunked_insert(i1, j1, j2)
+            synced = True
+        finally:
+            self.current_snapshot_id = None
+            if (
+                synced
+                and self.has_all_playlist_songs
+                and self.latest_snapshot_id
+            ):
+                # playlist_songs now holds the whole playlist as it is
+                # at latest_snapshot_id, so the cache doesn't need to
+                # fetch it again. It's replaced by a copy on the next
+                # sync.
+                self.playlist_cache.set_tracks(
+                    self.playlist_songs, self.latest_snapshot_id
+                )
+            else:
+                # The cached playlist tracks lack the changes made here,
+                # some of which may have been made before a failure.
+                self.playlist_cache.mark_stale()
 
     def sync_playlist(self, limit: t.Optional[int] = None) -> None:
         """
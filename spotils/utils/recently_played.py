@@ -4,6 +4,7 @@ from datetime import datetime
 from rich.table import Table
 
 from spotils import console, instance
+from spotils.helpers.logging import setup_logging
 from spotils.helpers.time import time_since
 
 GREY = "grey50"
@@ -11,6 +12,7 @@ GREY = "grey50"
 
 def print_recently_played_tracks(limit: int = 50) -> None:
     """Display the recently played tracks (upto limit) in a table."""
+    setup_logging()
     table = Table(
         title="Recently played tracks",
         caption="Recent -> Older",